@@ -2,14 +2,16 @@
 """Minimal background HTTP file server manager (description intentionally brief; use 'help' subcommand for full text)."""
 from __future__ import annotations
 import argparse
-import http.server
+import errno
 import os
 import sys
 import time
-import urllib.request
+import re
+import select
 import signal
+import socket
+from collections import defaultdict
 from pathlib import Path
-import contextlib
 
 HELP_TEXT = """
 Simple background HTTP file server manager for the SERVE_DIR directory.
@@ -24,7 +26,7 @@ Subcommands:
 Features:
     - Configurable port & bind address (bind defaults 0.0.0.0 all interfaces)
     - Log file redirection
-    - Health check via HTTP GET on root path
+    - Health check via HTTP HEAD on root path
     - Duplicate start protection via /proc detection of listening socket
     - Environment override SERVE_DIR selects served directory
 
@@ -45,15 +47,32 @@ DEFAULT_BIND = '0.0.0.0'
 DEFAULT_SERVE_DIR = Path(os.environ.get('SERVE_DIR', 'IMAGES'))
 DEFAULT_LOG = DEFAULT_SERVE_DIR / '.images_http.log'
 SUBCOMMANDS = ("start", "stop", "status", "restart", "help")
+MAX_WORKERS = 8  # pre-fork pool size cap (default: one worker per CPU)
+DAEMON_CMD = '__daemon__'  # hidden: internal entry point of the spawned server
+# (path, hex address width) of the kernel TCP tables; tcp6 is only read for IPv6 binds
+_TCP_TABLES = (('/proc/net/tcp', 8), ('/proc/net/tcp6', 32))
+# comm of interpreters that may run us (incl. the one the daemon is spawned with,
+# truncated like the kernel's 15-byte comm) or the script itself when exec'd via shebang
+_COMM_PREFIXES = (b'python', b'pypy', b'http_server')
+# sys.executable may be None or '' in embedded interpreters; a b'' prefix would match every comm
+if os.path.basename(sys.executable or ''):
+    _COMM_PREFIXES += (os.path.basename(sys.executable)[:15].encode(),)
+_SOCK_RE = re.compile(rb'socket:\[(\d+)\]')
 
 class Color:
-    if sys.stdout.isatty():
-        G='\033[32m'; R='\033[31m'; Y='\033[33m'; C='\033[36m'; B='\033[34m'; M='\033[35m'; N='\033[0m'
-    else:
-        G=R=Y=C=B=M=N=''
+    G='\033[32m'; R='\033[31m'; Y='\033[33m'; C='\033[36m'; B='\033[34m'; M='\033[35m'; N='\033[0m'
+
+_RESET = Color.N
+
+def _disable_colors():
+    """Blank all Color codes (non-tty or --no-color); called once from main()."""
+    Color.G = Color.R = Color.Y = Color.C = Color.B = Color.M = Color.N = ''
 
 def cprint(msg: str, color: str=''):
-    print(f"{color}{msg}{Color.N}")
+    if color:
+        print(color + msg + _RESET)
+    else:
+        print(msg)
 
 def _add_common_arguments(parser: argparse.ArgumentParser):
     """Attach arguments shared by operational subcommands."""
@@ -71,6 +90,7 @@ def parse_args(argv=None):
       - Custom root -h/--help to always show full extended help (HELP_TEXT)
       - Dedicated 'help' subcommand (mirrors many CLI tools) for consistency
       - Shared argument set extracted to _add_common_arguments() for reuse
+      - Operational subparsers are only built when the command is not 'help'
     """
     short_desc = "Background HTTP server manager for the IMAGES directory"
 
@@ -85,15 +105,20 @@ def parse_args(argv=None):
         epilog="Use 'help' subcommand for extended help.",
         add_help=False)
     parser.add_argument('-h','--help', action=FullHelpAction, nargs=0, help='Show extended help and exit')
-    subparsers = parser.add_subparsers(dest='cmd')  # manual validation allows no-arg help
-
-    # Operational subcommands
-    for name, help_text in (
-        ('start','Start server'),
-        ('restart','Restart server'),
-        ('status','Show status'),
-        ('stop','Stop server'),
-    ): _add_common_arguments(subparsers.add_parser(name, help=help_text))
+    # manual validation allows no-arg help; explicit metavar keeps usage listing every
+    # subcommand even when only the 'help' subparser is built
+    subparsers = parser.add_subparsers(dest='cmd', metavar='{' + ','.join(SUBCOMMANDS) + '}')
+
+    # Operational subcommands; skipped for 'help', which never uses their arguments
+    argv = sys.argv[1:] if argv is None else list(argv)
+    first = next((a for a in argv if not a.startswith('-')), None)
+    if first != 'help':
+        for name, help_text in (
+            ('start','Start server'),
+            ('restart','Restart server'),
+            ('status','Show status'),
+            ('stop','Stop server'),
+        ): _add_common_arguments(subparsers.add_parser(name, help=help_text))
 
     # Help subcommand (topic-specific)
     help_p = subparsers.add_parser('help', help='Show extended or topic help')
@@ -126,53 +151,108 @@ def parse_args(argv=None):
 
     return args
 
-def discover_servers() -> list[tuple[int,int]]:
-    """Return list of (pid, port) for running http_server.py processes (listening state)."""
+def _read_head(path: str, size: int=4096) -> bytes:
+    """Read at most size bytes from path with a single read() call."""
+    fd=os.open(path, os.O_RDONLY)
+    try: return os.read(fd, size)
+    finally: os.close(fd)
+
+def _listen_inodes(buf: bytes, addr_len: int, target_hex: bytes|None, out: dict[int,int]):
+    """Add inode -> port for LISTEN rows of a /proc/net/tcp[6] table held in buf.
+
+    After the variable-width "sl:" column the kernel prints fixed-width hex
+    (" %0NX:%04X %0NX:%04X %02X ...", N = addr_len), so port and state are probed
+    in place with startswith(); only LISTEN rows are sliced and split.
+    """
+    port_off = 2 + addr_len + 1                 # from the "sl" colon to the local port
+    st_off = port_off + 4 + 1 + addr_len + 1 + 4 + 1
+    end = len(buf)
+    pos = buf.find(b'\n') + 1                   # skip the header line
+    while 0 < pos < end:
+        eol = buf.find(b'\n', pos)
+        if eol < 0: eol = end
+        colon = buf.find(b':', pos, eol)
+        if (colon >= 0 and buf.startswith(b'0A', colon + st_off, eol)
+                and (target_hex is None or buf.startswith(target_hex, colon + port_off, eol))):
+            # local rem st tx:rx tr:when retrnsmt uid timeout inode ...
+            parts = buf[colon + 1:eol].split(None, 9)
+            try:
+                out[int(parts[8])] = int(buf[colon + port_off:colon + port_off + 4], 16)
+            except (ValueError, IndexError):
+                pass
+        pos = eol + 1
+
+def discover_servers(target_port: int|None=None, want_v6: bool=False) -> list[tuple[int,int]]:
+    """Return list of (pid, port) for running http_server.py processes (listening state).
+
+    With target_port, only listeners on that port are considered: PIDs are not fd-scanned
+    at all unless such a listener exists, and a PID's fd scan stops at the first hit.
+    /proc/net/tcp6 is only parsed when want_v6 is set.
+    """
     inode_map = {}
-    for table in ("/proc/net/tcp","/proc/net/tcp6"):
+    # /proc/net/tcp prints ports as 4 uppercase hex digits; compare bytes, skip int()
+    target_hex = b'%04X' % target_port if target_port is not None else None
+    for table, addr_len in _TCP_TABLES if want_v6 else _TCP_TABLES[:1]:
         try:
-            with open(table,'r') as f:
-                next(f)
-                for line in f:
-                    parts=line.split()
-                    if len(parts)<10: continue
-                    local=parts[1]; st=parts[3]; inode=parts[9]
-                    if st!='0A': continue
-                    try:
-                        _ip,phex=local.split(':')
-                        port=int(phex,16); inode_i=int(inode)
-                    except ValueError:
-                        continue
-                    inode_map[inode_i]=port
+            data=Path(table).read_bytes()
         except (FileNotFoundError,PermissionError):
             continue
-    if not inode_map:
+        _listen_inodes(data, addr_len, target_hex, inode_map)
+    if not inode_map:  # nothing (on target_port) is listening: skip the PID walk
         return []
     results=[]
-    for d in Path('/proc').iterdir():
-        if not d.name.isdigit(): continue
-        pid=int(d.name)
-        try: cmdline=(d/'cmdline').read_bytes().split(b'\0')
-        except Exception: continue
-        texts=[c.decode('utf-8','ignore') for c in cmdline if c]
-        if not any('http_server.py' in t for t in texts): continue
-        fd_dir=d/'fd'; seen=set()
-        try:
-            for fd in fd_dir.iterdir():
-                try: target=os.readlink(fd)
-                except OSError: continue
-                if target.startswith('socket:['):
-                    try: inode_i=int(target[8:-1])
-                    except ValueError: continue
-                    port=inode_map.get(inode_i)
-                    if port: seen.add(port)
-        except Exception:
-            pass
-        for p in seen:
-            results.append((pid,p))
-    return sorted(results)
-
-def server_start(args):
+    _lookup=inode_map.get  # most socket inodes miss; one local dict lookup rejects them
+    # os.scandir + plain string paths: no Path object per PID / fd entry
+    with os.scandir('/proc') as it:
+        for e in it:
+            name=e.name
+            if not name.isdigit(): continue
+            pid_path='/proc/'+name
+            # comm (<=16 bytes) rejects sshd, kernel threads etc. before the larger cmdline read
+            try:
+                if not _read_head(pid_path+'/comm', 16).startswith(_COMM_PREFIXES): continue
+            except PermissionError:
+                pass
+            except OSError:
+                continue
+            try: raw_cmdline=_read_head(pid_path+'/cmdline')
+            except OSError: continue
+            # Filter on cmdline before touching fd/ (no decode, no split)
+            if b'http_server.py' not in raw_cmdline: continue
+            pid=int(name)
+            try:
+                with os.scandir(pid_path+'/fd') as fds:
+                    for fd in fds:
+                        try: target=os.readlink(os.fsencode(fd.path))
+                        except OSError: continue
+                        m=_SOCK_RE.match(target)
+                        if not m: continue
+                        port=_lookup(int(m.group(1)))
+                        if port is None: continue
+                        results.append((pid,port))
+                        if port==target_port: break
+            except OSError:
+                pass
+    # Pre-fork workers share the master's listener; report only the master
+    pids={pid for pid,_ in results}
+    if len(pids)>1:
+        results=[r for r in results if _ppid(r[0]) not in pids]
+    # The same listener may be reachable through several fds
+    return sorted(set(results))
+
+def _ppid(pid: int) -> int|None:
+    """Parent PID from /proc/[pid]/stat, or None if unavailable."""
+    try: stat=_read_head('/proc/%d/stat' % pid, 512)
+    except OSError: return None
+    # comm (field 2) may contain spaces/parens; ppid is the 2nd field after the last ')'
+    try: return int(stat.rsplit(b')',1)[1].split()[1])
+    except (IndexError, ValueError): return None
+
+def server_start(args, _servers=None):
+    """Start the daemon unless a server already listens on the port.
+
+    _servers: discover_servers() result already gathered by the caller (restart).
+    """
     if args.port is None:
         args.port = DEFAULT_PORT
     # Normalize paths to absolute before chdir
@@ -182,7 +262,7 @@ def server_start(args):
     # Backward compatibility migrations (legacy log file relocation only)
     # 1. If old root-level log file exists (.images_http.log) and new target absent, migrate
     old_root_log = Path('.images_http.log').resolve()
-    if not Path(args.log_file).expanduser().resolve().exists() and old_root_log.exists() and old_root_log != log_file:
+    if not log_file.exists() and old_root_log.exists() and old_root_log != log_file:
         try:
             log_file.parent.mkdir(parents=True, exist_ok=True)
             old_root_log.replace(log_file)
@@ -194,18 +274,30 @@ def server_start(args):
         sys.exit(1)
 
     # Existing running via detection (filter by port if user specified)
-    existing=[(pid,port) for pid,port in discover_servers() if (args.port is None or port==args.port)]
+    if _servers is None:
+        _servers = discover_servers(args.port, ':' in args.bind)
+    existing=[(pid,port) for pid,port in _servers if (args.port is None or port==args.port)]
     if existing and (args.port is None or any(port==args.port for _,port in existing)):
         msg_port = args.port if args.port is not None else '/'.join(sorted({str(p) for _,p in existing}))
         cprint(f"Server already running (PID {existing[0][0]}) on port {msg_port}.", Color.Y)
         return
 
     # Fork style background (POSIX only)
-    # Pre-check port availability (best effort)
-    import socket
-    with contextlib.closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as s:
-        s.settimeout(0.2)
-        in_use = (s.connect_ex((args.bind, args.port)) == 0)
+    # Pre-check port availability (best effort): a bind() fails with EADDRINUSE
+    # immediately, no handshake or timeout. SO_REUSEADDR mirrors the real server
+    # so lingering TIME_WAIT sockets are not mistaken for a listener.
+    # getaddrinfo picks the address family, so IPv6 binds are probed correctly.
+    in_use = False
+    try:
+        family, stype, proto, _, addr = socket.getaddrinfo(args.bind, args.port, type=socket.SOCK_STREAM)[0]
+        s = socket.socket(family, stype, proto)
+        try:
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            s.bind(addr)
+        finally:
+            s.close()
+    except OSError as e:  # includes socket.gaierror; the child reports bad addresses
+        in_use = (e.errno == errno.EADDRINUSE)
     if in_use:
         cprint(f"Port {args.port} already in use on {args.bind}. Abort start.", Color.R)
         cprint("Suggestion: use 'ss -lntp | grep :%d' to find process or choose --port." % args.port, Color.Y)
@@ -214,53 +306,150 @@ def server_start(args):
     if args.bind == '0.0.0.0':
         cprint("WARNING: Serving on 0.0.0.0 (all interfaces). Ensure this is intended; consider firewalling or using --bind specific IP.", Color.Y)
     cprint(f"Starting HTTP server on {args.bind}:{args.port} serving {serve_dir}", Color.C)
-    pid = os.fork()
-    if pid > 0:
-        for _ in range(30):
-            servers = discover_servers()
-            match = [spid for spid,port in servers if port==args.port]
-            if match:
-                cprint(f"Started (PID {match[0]})", Color.G); break
-            time.sleep(0.1)
-        else:
-            cprint(f"Started (child PID {pid}) but listener not confirmed", Color.Y)
-        return
-
-    # child becomes session leader
-    os.setsid()
-    # second fork not strictly needed here
-
-    os.chdir(str(serve_dir))
-    # Redirect stdio
-    with open(log_file, 'ab', buffering=0) as lf:
-        os.dup2(lf.fileno(), 1)
-        os.dup2(lf.fileno(), 2)
-        # Close stdin
-        sys.stdin.close()
-        sys.stdin = open(os.devnull, 'r')
-
-    # Ensure parent directory for log exists
+    # Readiness pipe: daemon writes one byte once listening (EOF if it dies first),
+    # so the parent wakes exactly once instead of polling /proc
+    ready_r, ready_w = os.pipe()
+    os.set_inheritable(ready_w, True)
+    # posix_spawn a fresh interpreter instead of fork(): the daemon does not inherit
+    # (copy-on-write) this process's heap. -u keeps the log unbuffered.
+    try:
         log_file.parent.mkdir(parents=True, exist_ok=True)
-        class Handler(http.server.SimpleHTTPRequestHandler):
-            def log_message(self, format, *args):  # reduce noise; already in log
-                sys.stdout.write("%s - - [%s] %s\n" % (self.address_string(), self.log_date_time_string(), format%args))
+        pid = os.posix_spawn(sys.executable,
+            [sys.executable, '-u', os.path.abspath(__file__), DAEMON_CMD,
+             args.bind, str(args.port), str(serve_dir), str(ready_w)],
+            os.environ,
+            file_actions=[
+                (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+                (os.POSIX_SPAWN_OPEN, 1, str(log_file), os.O_WRONLY|os.O_APPEND|os.O_CREAT, 0o644),
+                (os.POSIX_SPAWN_DUP2, 1, 2),
+            ],
+            setsid=True)
+    except OSError as e:
+        # A failed log-file open action is reported against sys.executable; name the log
+        os.close(ready_r)
+        cprint(f"Cannot open log file {log_file}: {e.strerror or e}", Color.R)
+        sys.exit(1)
+    finally:
+        os.close(ready_w)
+    try:
+        readable, _, _ = select.select([ready_r], [], [], 3.0)
+        state = os.read(ready_r, 1) if readable else None
+    finally:
+        os.close(ready_r)
+    if state == b'':
+        cprint(f"Server exited during startup; see {log_file}", Color.R)
+        return
+    match = [spid for spid,port in discover_servers(args.port, ':' in args.bind) if port==args.port] if state else []
+    if match:
+        cprint(f"Started (PID {match[0]})", Color.G)
+    else:
+        cprint(f"Started (child PID {pid}) but listener not confirmed", Color.Y)
 
-        try:
-            httpd = http.server.ThreadingHTTPServer((args.bind, args.port), Handler)
-        except OSError as e:
-            sys.stdout.write(f"Failed to bind {args.bind}:{args.port} -> {e}\n")
-            sys.exit(1)
+def _daemon_main(argv: list[str]):
+    """Body of the hidden DAEMON_CMD subcommand spawned by server_start.
 
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            pass
-        finally:
-            httpd.server_close()
-            sys.exit(0)
-
-def server_stop(args):
-    servers=discover_servers()
+    argv is [bind, port, serve_dir, ready_fd]; stdio and setsid are already
+    set up by posix_spawn. The process binds, then runs as the master of a
+    small pre-fork worker pool until SIGTERM.
+    """
+    import http.server  # only the daemon serves files; keep stop/status startup lean
+    bind, port, serve_dir, ready_fd = argv[0], int(argv[1]), argv[2], int(argv[3])
+    os.chdir(serve_dir)
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):  # reduce noise; already in log
+            sys.stdout.write("%s - - [%s] %s\n" % (self.address_string(), self.log_date_time_string(), format%args))
+
+        def copyfile(self, source, outputfile):
+            # Let the kernel move file data to the socket (no userspace copies);
+            # directory listings (BytesIO) have no fileno and take the default path
+            # The fallback runs outside the except blocks so a client disconnect
+            # during it isn't logged chained to the fileno/sendfile error
+            fallback = False
+            try:
+                fd_in = source.fileno(); fd_out = outputfile.fileno()
+            except (AttributeError, OSError):
+                fallback = True
+            offset = 0
+            while not fallback:
+                try:
+                    sent = os.sendfile(fd_out, fd_in, offset, 1 << 20)
+                except OSError:
+                    if offset:  # part already on the wire; a resend would corrupt the body
+                        raise
+                    fallback = True
+                    break
+                if not sent:
+                    break
+                offset += sent
+            if fallback:
+                super().copyfile(source, outputfile)
+
+    try:
+        httpd = http.server.ThreadingHTTPServer((bind, port), Handler)
+    except OSError as e:
+        sys.stdout.write(f"Failed to bind {bind}:{port} -> {e}\n")
+        sys.exit(1)
+    # Readiness byte is advisory: the CLI may have timed out or been interrupted
+    # and closed its end, which must not take the server down with BrokenPipeError
+    try:
+        os.write(ready_fd, b'1')
+        os.close(ready_fd)
+    except OSError:
+        pass
+
+    # Pre-fork pool: workers accept on the shared listener, each with its own GIL.
+    # SIGTERM stays blocked until every worker exists and the master's handler is set.
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTERM})
+    # Non-blocking listener: a worker that loses the accept() race returns to its
+    # serve_forever loop instead of sleeping in accept(), so service_actions keeps running
+    httpd.socket.setblocking(False)
+    master_pid = os.getpid()
+
+    def _exit_if_orphaned():
+        # Master gone (kill -9, OOM): don't keep the port open as an orphan of init
+        if os.getppid() != master_pid:
+            os._exit(0)
+
+    workers = []
+    for _ in range(min(os.cpu_count() or 1, MAX_WORKERS)):
+        wpid = os.fork()
+        if wpid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGTERM})
+            httpd.service_actions = _exit_if_orphaned  # polled every serve_forever tick
+            try:
+                httpd.serve_forever()
+            finally:
+                os._exit(0)
+        workers.append(wpid)
+
+    def _terminate(signum, frame):
+        # Reap workers before exiting so the port is free once stop sees us gone
+        for wpid in workers:
+            try: os.kill(wpid, signal.SIGTERM)
+            except ProcessLookupError: pass
+        for wpid in workers:
+            try: os.waitpid(wpid, 0)
+            except ChildProcessError: pass
+        httpd.server_close()
+        os._exit(0)
+
+    signal.signal(signal.SIGTERM, _terminate)
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGTERM})
+    while workers:
+        try: wpid, _ = os.wait()
+        except ChildProcessError: break
+        if wpid in workers: workers.remove(wpid)
+    httpd.server_close()
+    sys.exit(0)
+
+def server_stop(args, _servers=None):
+    """Stop the single matching server; return its PID (None if nothing was stopped).
+
+    _servers: discover_servers() result already gathered by the caller (restart).
+    """
+    servers=discover_servers(args.port, want_v6=True) if _servers is None else _servers  # started --bind unknown here
     if not servers:
         cprint("No running server detected", Color.Y); return
     if args.port is not None:
@@ -268,78 +457,120 @@ def server_stop(args):
         if not servers:
             cprint("No server on specified port", Color.Y); return
     # Group by pid
-    grouped={}
+    # servers is sorted by (pid, port), so each port list is already in order
+    grouped=defaultdict(list)
     for spid,port in servers:
-        grouped.setdefault(spid, []).append(port)
+        grouped[spid].append(port)
     if len(grouped)>1:
         cprint("Multiple servers detected (ambiguous stop):", Color.Y)
         for spid,pl in grouped.items():
-            cprint(f"  PID {spid} ports {','.join(map(str,sorted(pl)))}", Color.Y)
+            cprint(f"  PID {spid} ports {','.join(map(str,pl))}", Color.Y)
         if args.port is None:
             cprint("Hint: specify --port to target a specific one.", Color.C)
         return
     pid,ports=next(iter(grouped.items()))
-    cprint(f"Stopping server PID {pid} (ports={','.join(map(str,sorted(ports)))})", Color.C)
+    cprint(f"Stopping server PID {pid} (ports={','.join(map(str,ports))})", Color.C)
+    # Open the pidfd before signalling so a recycled PID can't be mistaken for ours
+    try: pidfd = os.pidfd_open(pid)
+    except ProcessLookupError: pidfd = None; exited = True
+    except (AttributeError, OSError): pidfd = -1  # Python < 3.9 or kernel < 5.3
     try: os.kill(pid, signal.SIGTERM)
     except ProcessLookupError: pass
-    for _ in range(30):
+    if pidfd is not None and pidfd >= 0:
+        # pidfd becomes readable when the process exits: one wake, no polling
         try:
-            os.kill(pid, 0)
-        except OSError:
-            break
-        time.sleep(0.1)
-    else:
-        # still alive
+            poller = select.poll()
+            poller.register(pidfd, select.POLLIN)
+            exited = bool(poller.poll(3000))
+        finally:
+            os.close(pidfd)
+    elif pidfd is not None:
+        for _ in range(30):
+            try:
+                os.kill(pid, 0)
+            except OSError:
+                break
+            time.sleep(0.1)
         try:
             os.kill(pid, 0)
-            still_alive = True
+            exited = False
         except OSError:
-            still_alive = False
-        if not still_alive:
-            cprint("Stopped", Color.G); return
-        # If here, force kill path
+            exited = True
+    if not exited:
         cprint("Force killing...", Color.Y)
-        try: os.kill(pid, signal.SIGKILL)
-        except ProcessLookupError: pass
+        # The daemon leads its own session: take its pre-fork workers down with it
+        try: os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            try: os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError: pass
     cprint("Stopped", Color.G)
+    return pid
+
+def _http_status_probe(host: str, port: int, timeout: float) -> int:
+    """HEAD / over a raw socket and return the HTTP status code (no urllib/http.client)."""
+    host_hdr = f"[{host}]" if ':' in host else host  # IPv6 literals need brackets
+    with socket.create_connection((host, port), timeout) as s:
+        s.sendall(b'HEAD / HTTP/1.0\r\nHost: ' + host_hdr.encode() + b'\r\n\r\n')
+        buf = b''
+        # Drain to EOF (the server closes HTTP/1.0 connections): closing with unread
+        # data would RST the connection and log a ConnectionResetError in the daemon
+        while True:
+            chunk = s.recv(4096)
+            if not chunk: break
+            if len(buf) < 32: buf += chunk
+    try:
+        return int(buf.split(b' ', 2)[1])
+    except (IndexError, ValueError):
+        raise OSError(f"Malformed HTTP response: {buf[:32]!r}") from None
 
 def server_status(args):
-    servers=discover_servers()
+    servers=discover_servers(args.port, want_v6=True)  # started --bind unknown here
     if not servers:
         cprint("Not running", Color.R); return
     if args.port is not None:
         servers=[s for s in servers if s[1]==args.port]
         if not servers:
             cprint("Not running on specified port", Color.R); return
-    grouped={}
+    # servers is sorted by (pid, port), so each port list is already in order
+    grouped=defaultdict(list)
     for spid,port in servers:
-        grouped.setdefault(spid, []).append(port)
+        grouped[spid].append(port)
     if len(grouped)>1 and args.port is None:
         cprint("Multiple servers detected:", Color.Y)
         for spid,pl in grouped.items():
-            cprint(f"  PID {spid} ports {','.join(map(str,sorted(pl)))}", Color.Y)
+            cprint(f"  PID {spid} ports {','.join(map(str,pl))}", Color.Y)
         cprint("Specify --port for detailed health check.", Color.C)
         return
-    pid,ports=next(iter(grouped.items())) if len(grouped)==1 else (list(grouped.keys())[0], grouped[list(grouped.keys())[0]])
-    cprint(f"Running (PID {pid}) (ports={','.join(map(str,sorted(ports)))})", Color.G)
+    pid,ports=next(iter(grouped.items()))
+    cprint(f"Running (PID {pid}) (ports={','.join(map(str,ports))})", Color.G)
     if len(ports)==1:
         url = f"http://{args.bind}:{ports[0]}/"
         time.sleep(0.1)
         try:
-            with urllib.request.urlopen(url, timeout=args.timeout) as r:
-                cprint(f"Health OK HTTP {r.status}", Color.G)
+            code = _http_status_probe(args.bind, ports[0], args.timeout)
+            if code >= 400:
+                raise OSError(f"HTTP Error {code} for {url}")
+            cprint(f"Health OK HTTP {code}", Color.G)
         except Exception as e:
             cprint(f"Health check failed: {e}", Color.R)
             cprint("Possible causes: server still starting, port/firewall blocked, wrong bind/port used.", Color.Y)
 
 def server_restart(args):
-    server_stop(args)
-    server_start(args)
+    # One /proc walk serves both halves; start only needs to know what stop left running
+    servers = discover_servers(args.port, want_v6=True)
+    stopped = server_stop(args, _servers=servers)
+    server_start(args, _servers=[s for s in servers if s[0] != stopped])
 
 def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == [DAEMON_CMD]:
+        _daemon_main(argv[1:])
+        return
+    if not sys.stdout.isatty():
+        _disable_colors()
     args = parse_args(argv)
     if args.no_color:
-        Color.G = Color.R = Color.Y = Color.C = Color.B = Color.M = Color.N = ''
+        _disable_colors()
 
     if args.cmd == 'start':
         server_start(args)